@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 import json
 from werkzeug.utils import secure_filename
 from utils.rag_chain import CAGChain
+from utils.corpus_manager import CorpusManager
 
 load_dotenv()
 
@@ -53,11 +54,19 @@ app.config['RAG_DOCS_FOLDER'] = 'rag_docs'
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['RAG_DOCS_FOLDER'], exist_ok=True)
 
-# Initialize CAG chain with the TXT file
-handbook_path = os.path.join(app.config['RAG_DOCS_FOLDER'], 'The Reef Administration Handbook.txt')
-cag_chain = CAGChain(handbook_path)
+# Initialize the document corpus; documents are loaded lazily into a bounded cache
+corpus = CorpusManager(
+    app.config['RAG_DOCS_FOLDER'],
+    max_cache_bytes=int(os.getenv('DOCUMENT_CACHE_MAX_BYTES', 8 * 1024 * 1024))
+)
+
+# Initialize CAG chain with the default handbook
+default_document = os.getenv('DEFAULT_DOCUMENT', 'The Reef Administration Handbook.txt')
+cag_chain = CAGChain(corpus, default_document)
 
-# CAG system initializes automatically with the PDF
+# Build the vector index off the request path so corpus-wide queries do not wait on it
+if os.getenv('INDEX_CORPUS_ON_STARTUP', 'false').lower() == 'true':
+    corpus.start_background_indexing()
 
 # Password protection
 def require_auth():
@@ -119,12 +128,13 @@ def status():
     
     return jsonify({
         'app_status': 'healthy',
-        'handbook_loaded': cag_chain.has_document(),
-        'handbook_path': handbook_path,
+        'handbook_loaded': cag_chain.is_loaded(),
+        'default_document': default_document,
+        'corpus': corpus.get_status(),
         'openai_configured': cag_chain.openai_client is not None
     })
 
-# Upload endpoint removed - CAG works with the single cached PDF
+# Upload endpoint removed - CAG serves the documents in the RAG docs folder
 
 @app.route('/chat', methods=['POST'])
 @limiter.limit("10 per minute")
@@ -133,20 +143,25 @@ def chat():
         return jsonify({'error': 'Authentication required'}), 401
     data = request.get_json()
     query = data.get('query', '')
+    document = data.get('document')
     
     if not query:
         return jsonify({'error': 'No query provided'}), 400
     
-    # Check if we have the handbook cached
-    if not cag_chain.has_document():
+    if document is not None and not isinstance(document, str):
+        return jsonify({'error': 'Document must be a file name'}), 400
+    
+    # Check if the requested document is available
+    if not cag_chain.has_document(document):
         def no_handbook_response():
-            yield f"data: {json.dumps({'response': 'The Reef Administration Handbook is not available or could not be loaded.'})}\n\n"
+            yield f"data: {json.dumps({'response': 'The requested handbook is not available or could not be loaded.'})}\n\n"
             yield f"data: {json.dumps({'done': True})}\n\n"
         return Response(no_handbook_response(), mimetype='text/event-stream')
     
     def generate_response():
         try:
-            for chunk in cag_chain.generate_response(query, stream=True):
+            document_content = cag_chain.build_context(query, document)
+            for chunk in cag_chain.generate_response(query, document_content, stream=True):
                 yield f"data: {json.dumps({'response': chunk})}\n\n"
             yield f"data: {json.dumps({'done': True})}\n\n"
         except Exception as e:
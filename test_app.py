@@ -50,12 +50,169 @@ def test_flask_app():
                 print("✅ Main page loading")
             else:
                 print(f"❌ Main page failed: {response.status_code}")
+            
+            # Test chat rejects a non-string document
+            with client.session_transaction() as sess:
+                sess['authenticated'] = True
+            response = client.post('/chat', json={'query': 'x', 'document': ['a']})
+            if response.status_code == 400:
+                print("✅ Chat rejects invalid document")
+            else:
+                print(f"❌ Chat accepted invalid document: {response.status_code}")
+                return False
                 
         return True
     except Exception as e:
         print(f"❌ Flask app error: {e}")
         return False
 
+def _write_corpus(folder, files):
+    """Write {file name: text} into a temporary corpus folder"""
+    for name, text in files.items():
+        with open(os.path.join(folder, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+def test_corpus_manager():
+    """Test byte-bounded LRU caching of the document corpus"""
+    try:
+        import tempfile
+        from utils.corpus_manager import CorpusManager
+        
+        with tempfile.TemporaryDirectory() as folder:
+            _write_corpus(folder, {
+                'a.txt': 'a' * 100,
+                'b.txt': 'b' * 100,
+                'c.txt': 'c' * 100,
+                'huge.txt': 'h' * 500
+            })
+            corpus = CorpusManager(folder, max_cache_bytes=250)
+            
+            # a, b fit; touching a makes b least recently used, so c evicts b
+            corpus.get_document('a.txt')
+            corpus.get_document('b.txt')
+            corpus.get_document('a.txt')
+            corpus.get_document('c.txt')
+            
+            status = corpus.get_status()
+            documents = {doc['name']: doc for doc in status['documents']}
+            assert status['cache_order'] == ['a.txt', 'c.txt'], f"cache order {status['cache_order']}"
+            assert status['cache_bytes'] == 200, f"cache_bytes {status['cache_bytes']}"
+            assert documents['b.txt']['evictions'] == 1 and not documents['b.txt']['cached']
+            assert documents['a.txt']['hits'] == 1 and documents['a.txt']['evictions'] == 0
+            print("✅ Document cache evicts least recently used documents")
+            
+            # Oversized documents are served but never displace the cache
+            assert corpus.get_document('huge.txt') == 'h' * 500
+            status = corpus.get_status()
+            assert status['cache_order'] == ['a.txt', 'c.txt'] and status['cache_bytes'] == 200
+            print("✅ Oversized documents served uncached")
+            
+            # Existence checks never load documents
+            loads = {doc['name']: doc['loads'] for doc in status['documents']}
+            assert corpus.has_document('b.txt') and not corpus.is_loaded('missing.txt')
+            status = corpus.get_status()
+            assert {doc['name']: doc['loads'] for doc in status['documents']} == loads
+            
+            # Edited documents are reloaded, deleted ones dropped from the cache
+            _write_corpus(folder, {'c.txt': 'C' * 50})
+            os.utime(os.path.join(folder, 'c.txt'), (0, 0))
+            assert corpus.get_document('c.txt') == 'C' * 50
+            os.remove(os.path.join(folder, 'a.txt'))
+            assert corpus.get_document('a.txt') is None and not corpus.has_document('a.txt')
+            status = corpus.get_status()
+            assert status['cache_order'] == ['c.txt'] and status['cache_bytes'] == 50, status
+            print("✅ Stale cache entries reloaded or dropped")
+            
+            assert corpus.get_document('missing.txt') is None
+            assert not corpus.has_document('missing.txt')
+        
+        with tempfile.TemporaryDirectory() as folder:
+            # One handbook in two formats is a single document, served from the TXT
+            _write_corpus(folder, {'Handbook.txt': 'text', 'Handbook.docx': 'not really docx'})
+            corpus = CorpusManager(folder)
+            assert list(corpus.list_documents()) == ['Handbook.txt'], corpus.list_documents()
+            print("✅ Duplicate handbook formats collapsed to one document")
+        
+        return True
+    except AssertionError as e:
+        print(f"❌ Corpus manager check failed: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Corpus manager error: {e}")
+        return False
+
+class _FakeVectorStore:
+    """In-memory stand-in for VectorStore that records what gets indexed"""
+    
+    def __init__(self, failing_sources=()):
+        self.chunks = []
+        self.failing_sources = set(failing_sources)
+        self.add_calls = 0
+    
+    def add_documents(self, texts, metadatas=None):
+        self.add_calls += 1
+        if metadatas[0]['source'] in self.failing_sources:
+            raise ValueError("Embedding request failed")
+        self.chunks.extend(zip(texts, metadatas))
+    
+    def get_indexed_sources(self):
+        return {metadata['source'] for _, metadata in self.chunks}
+    
+    def similarity_search(self, query, k=5, sources=None):
+        return [
+            {'content': text, 'metadata': metadata, 'distance': 0.0}
+            for text, metadata in self.chunks
+            if sources is None or metadata['source'] in sources
+        ][:k]
+
+def test_cag_routing():
+    """Test that CAGChain routes queries to one document or the whole corpus"""
+    try:
+        import tempfile
+        from utils.corpus_manager import CorpusManager
+        from utils.rag_chain import CAGChain
+        
+        with tempfile.TemporaryDirectory() as folder:
+            _write_corpus(folder, {'2023.txt': 'Handbook 2023.', '2024.txt': 'Handbook 2024.'})
+            vector_store = _FakeVectorStore(failing_sources={'broken.txt'})
+            corpus = CorpusManager(folder, vector_store=vector_store)
+            cag_chain = CAGChain(corpus, '2023.txt')
+            
+            assert cag_chain.is_loaded()
+            assert cag_chain.build_context('q') == 'Handbook 2023.'
+            assert cag_chain.build_context('q', '2024.txt') == 'Handbook 2024.'
+            assert cag_chain.has_document('2024.txt') and not cag_chain.has_document('1999.txt')
+            print("✅ Queries routed to the requested document")
+            
+            context = cag_chain.build_context('q', CAGChain.ALL_DOCUMENTS)
+            assert '[Source: 2023.txt]' in context and '[Source: 2024.txt]' in context, context
+            
+            # Handbooks added later are indexed on the next corpus-wide query
+            _write_corpus(folder, {'2025.txt': 'Handbook 2025.'})
+            context = cag_chain.build_context('q', CAGChain.ALL_DOCUMENTS)
+            assert '[Source: 2025.txt]' in context, context
+            assert len(vector_store.chunks) == 3, vector_store.chunks
+            print("✅ Corpus-wide queries retrieve across every document")
+            
+            # A file that fails to index is not retried until it changes
+            _write_corpus(folder, {'broken.txt': 'Broken handbook.'})
+            cag_chain.build_context('q', CAGChain.ALL_DOCUMENTS)
+            calls = vector_store.add_calls
+            cag_chain.build_context('q', CAGChain.ALL_DOCUMENTS)
+            assert vector_store.add_calls == calls, "failed file was retried"
+            os.utime(os.path.join(folder, 'broken.txt'), (0, 0))
+            cag_chain.build_context('q', CAGChain.ALL_DOCUMENTS)
+            assert vector_store.add_calls == calls + 1, "changed file was not retried"
+            print("✅ Failed files retried only after they change")
+        
+        return True
+    except AssertionError as e:
+        print(f"❌ CAG routing check failed: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ CAG routing error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🧪 Testing The Reef Chat Application")
@@ -77,20 +234,27 @@ def main():
     
     if import_success:
         flask_success = test_flask_app()
+        print()
+        corpus_success = test_corpus_manager()
+        print()
+        routing_success = test_cag_routing()
     else:
         print("❌ Skipping Flask tests due to import failures")
-        flask_success = False
+        flask_success = corpus_success = routing_success = False
     
     print()
     print("=" * 40)
+    print(f"Flask app: {'✅' if flask_success else '❌'}")
+    print(f"Corpus manager: {'✅' if corpus_success else '❌'}")
+    print(f"CAG routing: {'✅' if routing_success else '❌'}")
     
-    if import_success and flask_success:
+    if import_success and flask_success and corpus_success and routing_success:
         print("🎉 All tests passed! The application is ready to run.")
         print("💡 To start the app: python app.py")
     else:
         print("❌ Some tests failed. Please check the errors above.")
         
-    return import_success and flask_success
+    return import_success and flask_success and corpus_success and routing_success
 
 if __name__ == "__main__":
     success = main()
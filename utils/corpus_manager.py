@@ -0,0 +1,241 @@
+import os
+import glob
+import time
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+from .document_processor import DocumentProcessor
+
+class CorpusManager:
+    """Lazily loads a folder of documents into a size-bounded LRU cache."""
+
+    # Rough characters-per-token ratio used for reporting cache usage
+    CHARS_PER_TOKEN = 4
+
+    # When a handbook ships in several formats, the first match here is served
+    FORMAT_PREFERENCE = ['.txt', '.docx', '.pdf']
+
+    def __init__(self, folder_path: str, max_cache_bytes: int = 8 * 1024 * 1024,
+                 doc_processor: DocumentProcessor = None, vector_store=None):
+        self.folder_path = folder_path
+        self.max_cache_bytes = max_cache_bytes
+        self.doc_processor = doc_processor or DocumentProcessor()
+        self.vector_store = vector_store
+
+        # name -> {"path", "mtime", "content", "size_bytes"}, least recently used first
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._stats = {}  # name -> load/hit statistics
+        self._lock = threading.Lock()
+
+        self._indexed_sources = None  # document names with chunks in the vector store
+        self._index_failures = {}  # file path -> mtime of the version that failed to index
+        self._index_lock = threading.Lock()
+
+    def list_documents(self) -> Dict[str, str]:
+        """Map document names to file paths, one file per handbook base name."""
+        if not os.path.exists(self.folder_path):
+            return {}
+
+        preferred = {}  # base name -> file path in the most preferred format
+        for ext in self.doc_processor.SUPPORTED_EXTENSIONS:
+            pattern = os.path.join(self.folder_path, f"*{ext}")
+            for file_path in glob.glob(pattern):
+                base_name = os.path.splitext(os.path.basename(file_path))[0]
+                current = preferred.get(base_name)
+                if current is None or self._format_rank(file_path) < self._format_rank(current):
+                    preferred[base_name] = file_path
+
+        documents = {os.path.basename(file_path): file_path for file_path in preferred.values()}
+        return dict(sorted(documents.items()))
+
+    def _format_rank(self, file_path: str) -> int:
+        """Rank a file by FORMAT_PREFERENCE; lower is preferred."""
+        ext = os.path.splitext(file_path.lower())[1]
+        if ext in self.FORMAT_PREFERENCE:
+            return self.FORMAT_PREFERENCE.index(ext)
+        return len(self.FORMAT_PREFERENCE)
+
+    def _get_mtime(self, file_path: str) -> Optional[float]:
+        """Return the file's modification time, or None if it has disappeared."""
+        try:
+            return os.path.getmtime(file_path)
+        except OSError:
+            return None
+
+    def has_document(self, name: str) -> bool:
+        """Check if a document exists in the corpus folder without loading it."""
+        return name in self.list_documents()
+
+    def is_loaded(self, name: str) -> bool:
+        """Check if the document's last load yielded text, without loading it."""
+        if not self.has_document(name):
+            return False
+        with self._lock:
+            return self._stats.get(name, {}).get("available", False)
+
+    def get_document(self, name: str) -> Optional[str]:
+        """Return document text, loading it into the cache on first use or after a change."""
+        file_path = self.list_documents().get(name)
+        mtime = self._get_mtime(file_path) if file_path else None
+
+        with self._lock:
+            entry = self._cache.get(name)
+            if entry and (entry["path"], entry["mtime"]) == (file_path, mtime):
+                self._cache.move_to_end(name)
+                self._stats[name]["hits"] += 1
+                return entry["content"]
+            if entry:
+                # Deleted, edited, or replaced by a preferred format
+                self._drop(name)
+
+        if mtime is None:
+            return None
+
+        # Extract outside the lock so a slow PDF does not block cache hits
+        start = time.perf_counter()
+        content = self.doc_processor.extract_text(file_path)
+        load_time = time.perf_counter() - start
+
+        with self._lock:
+            stats = self._stats.setdefault(name, {"loads": 0, "hits": 0, "evictions": 0})
+            stats["loads"] += 1
+            stats["last_load_seconds"] = round(load_time, 4)
+
+            if not content or not content.strip():
+                stats["available"] = False
+                print(f"❌ No text extracted from: {file_path}")
+                return None
+
+            size = len(content.encode('utf-8'))
+            stats["available"] = True
+            stats["size_bytes"] = size
+
+            if name in self._cache:
+                # Another request loaded it while we were extracting
+                self._cache.move_to_end(name)
+                return self._cache[name]["content"]
+
+            if size > self.max_cache_bytes:
+                print(f"⚠️  {name} ({size} bytes) exceeds cache limit, serving uncached")
+                return content
+
+            while self._cache and self._cache_bytes + size > self.max_cache_bytes:
+                evicted_name, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted["size_bytes"]
+                self._stats[evicted_name]["evictions"] += 1
+                print(f"♻️  Evicted {evicted_name} from document cache")
+
+            self._cache[name] = {
+                "path": file_path,
+                "mtime": mtime,
+                "content": content,
+                "size_bytes": size
+            }
+            self._cache_bytes += size
+
+        print(f"✅ Cached {name}: {len(content)} characters in {load_time:.2f}s")
+        return content
+
+    def _drop(self, name: str) -> None:
+        """Remove a stale cache entry; caller must hold the lock."""
+        entry = self._cache.pop(name)
+        self._cache_bytes -= entry["size_bytes"]
+
+    def retrieve(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Search across every document in the corpus via the vector store."""
+        vector_store = self._get_vector_store()
+        if vector_store is None:
+            return []
+
+        # If indexing is already running elsewhere, search what is there instead of waiting
+        self._index_missing(vector_store, wait=False)
+        return vector_store.similarity_search(query, k=k, sources=list(self.list_documents()))
+
+    def start_background_indexing(self) -> None:
+        """Index the corpus in a daemon thread so the first corpus-wide query is not slowed."""
+        vector_store = self._get_vector_store()
+        if vector_store is None:
+            return
+        threading.Thread(target=self._index_missing, args=(vector_store,), daemon=True).start()
+
+    def _index_missing(self, vector_store, wait: bool = True) -> None:
+        """Add corpus documents that have no chunks in the vector store yet."""
+        if not self._index_lock.acquire(blocking=wait):
+            return
+        try:
+            if self._indexed_sources is None:
+                # The store may already hold documents indexed by an earlier process
+                self._indexed_sources = vector_store.get_indexed_sources()
+
+            missing = {}
+            for name, path in self.list_documents().items():
+                if name in self._indexed_sources:
+                    continue
+                mtime = self._get_mtime(path)
+                if self._index_failures.get(path) == mtime:
+                    continue  # Unchanged since it last failed; retried once the file changes
+                missing[path] = mtime
+            if not missing:
+                return
+
+            from .document_loader import DocumentLoader
+            results = DocumentLoader(self.doc_processor, vector_store).load_files(list(missing))
+
+            processed = {item["file"] for item in results["processed_files"]}
+            for path, mtime in missing.items():
+                name = os.path.basename(path)
+                if name in processed:
+                    self._indexed_sources.add(name)
+                    self._index_failures.pop(path, None)
+                else:
+                    self._index_failures[path] = mtime
+        except Exception as e:
+            print(f"❌ Error indexing corpus: {e}")
+        finally:
+            self._index_lock.release()
+
+    def _get_vector_store(self):
+        """Create the vector store on first use; ChromaDB is an optional dependency."""
+        if self.vector_store is None:
+            try:
+                from .vector_store import VectorStore
+            except ImportError:
+                print("❌ ChromaDB not installed, cross-document retrieval unavailable")
+                return None
+            self.vector_store = VectorStore(os.getenv('VECTOR_DB_PATH', './vector_db'))
+        return self.vector_store
+
+    def get_status(self) -> Dict[str, Any]:
+        """Report per-document cache residency and load statistics."""
+        documents = self.list_documents()
+        mtimes = {name: self._get_mtime(path) for name, path in documents.items()}
+
+        with self._lock:
+            for name in list(self._cache):
+                entry = self._cache[name]
+                if (entry["path"], entry["mtime"]) != (documents.get(name), mtimes.get(name)):
+                    self._drop(name)
+
+            document_status = []
+            for name in documents:
+                stats = self._stats.get(name, {})
+                entry = self._cache.get(name)
+                document_status.append({
+                    "name": name,
+                    "cached": entry is not None,
+                    "size_bytes": stats.get("size_bytes"),
+                    "estimated_tokens": len(entry["content"]) // self.CHARS_PER_TOKEN if entry else None,
+                    "loads": stats.get("loads", 0),
+                    "hits": stats.get("hits", 0),
+                    "evictions": stats.get("evictions", 0),
+                    "last_load_seconds": stats.get("last_load_seconds")
+                })
+
+            return {
+                "documents": document_status,
+                "cache_order": list(self._cache),
+                "cache_bytes": self._cache_bytes,
+                "max_cache_bytes": self.max_cache_bytes,
+                "cached_count": len(self._cache)
+            }
@@ -1,13 +1,16 @@
 import os
 import glob
-from typing import List, Dict, Any
+from typing import List, Dict, Any, TYPE_CHECKING
 from .document_processor import DocumentProcessor
-from .vector_store import VectorStore
+
+if TYPE_CHECKING:
+    # ChromaDB is optional; only import VectorStore for type hints
+    from .vector_store import VectorStore
 
 class DocumentLoader:
     """Handles loading documents from folders into vector store."""
     
-    def __init__(self, doc_processor: DocumentProcessor, vector_store: VectorStore):
+    def __init__(self, doc_processor: DocumentProcessor, vector_store: 'VectorStore'):
         self.doc_processor = doc_processor
         self.vector_store = vector_store
     
@@ -16,14 +19,6 @@ class DocumentLoader:
         if not os.path.exists(folder_path):
             return {"success": False, "message": f"Folder {folder_path} does not exist"}
         
-        results = {
-            "success": True,
-            "processed_files": [],
-            "skipped_files": [],
-            "total_chunks": 0,
-            "errors": []
-        }
-        
         # Get all files in the folder
         all_files = []
         for ext in self.doc_processor.SUPPORTED_EXTENSIONS:
@@ -36,7 +31,19 @@ class DocumentLoader:
                 "message": f"No supported files found in {folder_path}. Supported: {self.doc_processor.SUPPORTED_EXTENSIONS}"
             }
         
-        for file_path in all_files:
+        return self.load_files(all_files)
+    
+    def load_files(self, file_paths: List[str]) -> Dict[str, Any]:
+        """Load the given document files into vector store."""
+        results = {
+            "success": True,
+            "processed_files": [],
+            "skipped_files": [],
+            "total_chunks": 0,
+            "errors": []
+        }
+        
+        for file_path in file_paths:
             try:
                 filename = os.path.basename(file_path)
                 print(f"Processing {filename}...")
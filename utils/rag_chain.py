@@ -1,14 +1,17 @@
 from openai import OpenAI
 import os
-from typing import Generator
-from .document_processor import DocumentProcessor
+from typing import Generator, Optional
+from .corpus_manager import CorpusManager
 
 class CAGChain:
-    """Cache-Augmented Generation pipeline for single PDF."""
+    """Cache-Augmented Generation pipeline over a corpus of documents."""
     
-    def __init__(self, document_path: str):
-        self.document_path = document_path
-        self.document_content = None
+    # Document name that routes a query to vector store retrieval across the corpus
+    ALL_DOCUMENTS = 'all'
+    
+    def __init__(self, corpus: CorpusManager, default_document: str):
+        self.corpus = corpus
+        self.default_document = default_document
         
         # Initialize OpenAI client if API key is available
         api_key = os.getenv('OPENAI_API_KEY')
@@ -65,40 +68,43 @@ GUARDRAILS - DO NOT:
 
 Remember: You're here to be a proactive guide, helping our community members navigate their entire music release journey step by step using our comprehensive handbook."""
         
-        # Cache the document content on initialization
-        self._cache_document()
-    
-    def _cache_document(self):
-        """Cache the document content for reuse."""
-        if os.path.exists(self.document_path):
-            if self.document_path.endswith('.txt'):
-                # Handle TXT files directly
-                with open(self.document_path, 'r', encoding='utf-8') as f:
-                    self.document_content = f.read()
-                print(f"✅ Cached TXT content: {len(self.document_content)} characters")
-            else:
-                # Handle other file types through DocumentProcessor
-                doc_processor = DocumentProcessor()
-                self.document_content = doc_processor.extract_text(self.document_path)
-                print(f"✅ Cached document content: {len(self.document_content)} characters")
+        # Warm the cache with the default document so the first request is fast
+        if self.corpus.has_document(self.default_document):
+            self.corpus.get_document(self.default_document)
         else:
-            self.document_content = None
-            print(f"❌ Document not found at: {self.document_path}")
+            print(f"❌ Default document not found in {self.corpus.folder_path}: {self.default_document}")
+    
+    def _resolve_document(self, document: Optional[str]) -> str:
+        """Fall back to the default document when none is requested."""
+        return document or self.default_document
+    
+    def build_context(self, query: str, document: str = None) -> Optional[str]:
+        """Return cached document text, or retrieved chunks for the whole corpus."""
+        document = self._resolve_document(document)
+        if document == self.ALL_DOCUMENTS:
+            results = self.corpus.retrieve(query)
+            if not results:
+                return None
+            return "\n\n".join(
+                f"[Source: {result['metadata'].get('source', 'unknown')}]\n{result['content']}"
+                for result in results
+            )
+        return self.corpus.get_document(document)
     
-    def generate_response(self, query: str, stream: bool = True) -> Generator[str, None, None]:
-        """Generate response using Cache-Augmented Generation."""
+    def generate_response(self, query: str, document_content: Optional[str], stream: bool = True) -> Generator[str, None, None]:
+        """Generate response using Cache-Augmented Generation over context from build_context."""
         if not self.openai_client:
             yield "Error: OpenAI API key not configured. Please set OPENAI_API_KEY in your .env file."
             return
-            
-        if not self.document_content:
+        
+        if not document_content:
             yield "Error: No document cached or document could not be processed."
             return
         
         # Create prompt with cached document content
         messages = [
             {"role": "system", "content": self.system_message},
-            {"role": "user", "content": f"Document Content:\n{self.document_content}\n\nQuestion: {query}"}
+            {"role": "user", "content": f"Document Content:\n{document_content}\n\nQuestion: {query}"}
         ]
         
         # Generate response
@@ -123,6 +129,13 @@ Remember: You're here to be a proactive guide, helping our community members nav
             )
             yield response.choices[0].message.content
     
-    def has_document(self) -> bool:
-        """Check if document is loaded."""
-        return self.document_content is not None and len(self.document_content.strip()) > 0
\ No newline at end of file
+    def has_document(self, document: str = None) -> bool:
+        """Check if the requested document exists in the corpus, without loading it."""
+        document = self._resolve_document(document)
+        if document == self.ALL_DOCUMENTS:
+            return len(self.corpus.list_documents()) > 0
+        return self.corpus.has_document(document)
+    
+    def is_loaded(self, document: str = None) -> bool:
+        """Check if the requested document last loaded with non-empty content."""
+        return self.corpus.is_loaded(self._resolve_document(document))
\ No newline at end of file
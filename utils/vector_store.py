@@ -1,6 +1,6 @@
 import chromadb
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set
 from openai import OpenAI
 import hashlib
 
@@ -24,17 +24,20 @@ class VectorStore:
     
     def add_documents(self, texts: List[str], metadatas: List[Dict[str, Any]] = None) -> None:
         """Add documents to the vector store."""
-        if not texts or not self.openai_client:
+        if not texts:
             return
         
         if metadatas is None:
             metadatas = [{"source": "unknown"} for _ in texts]
         
-        # Generate embeddings
+        # Generate embeddings; raises if the OpenAI client is not configured
         embeddings = self._get_embeddings(texts)
         
-        # Generate unique IDs
-        ids = [self._generate_id(text) for text in texts]
+        # Generate unique IDs; identical text in different handbooks or chunks must not collide
+        ids = [
+            self._generate_id(f"{metadata.get('source')}:{metadata.get('chunk_index', i)}:{text}")
+            for i, (text, metadata) in enumerate(zip(texts, metadatas))
+        ]
         
         # Add to collection
         self.collection.add(
@@ -44,8 +47,8 @@ class VectorStore:
             ids=ids
         )
     
-    def similarity_search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
-        """Search for similar documents."""
+    def similarity_search(self, query: str, k: int = 5, sources: List[str] = None) -> List[Dict[str, Any]]:
+        """Search for similar documents, optionally limited to the given source files."""
         if not self.openai_client:
             return []
             
@@ -53,7 +56,8 @@ class VectorStore:
         
         results = self.collection.query(
             query_embeddings=[query_embedding],
-            n_results=k
+            n_results=k,
+            where={"source": {"$in": sources}} if sources else None
         )
         
         documents = []
@@ -89,6 +93,11 @@ class VectorStore:
             metadata={"hnsw:space": "cosine"}
         )
     
+    def get_indexed_sources(self) -> Set[str]:
+        """Get the source file names that have chunks in the collection."""
+        results = self.collection.get(include=["metadatas"])
+        return {metadata.get('source') for metadata in results['metadatas'] if metadata}
+    
     def get_collection_count(self) -> int:
         """Get number of documents in collection."""
         return self.collection.count()
\ No newline at end of file